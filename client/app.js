@@ -150,6 +150,7 @@ function connect() {
 
     try {
         state.socket = new WebSocket(CONFIG.clientWsUrl);
+        state.socket.binaryType = 'arraybuffer';
 
         state.socket.onopen = () => {
             state.connected = true;
@@ -197,26 +198,19 @@ function disconnect() {
 }
 
 // Message Handling
+const textDecoder = new TextDecoder();
+
 function handleMessage(event) {
     try {
-        const data = JSON.parse(event.data);
-
-        // DEBUG: Log received data structure
-        console.log('Received frame:', {
-            type: data.type,
-            hasData: !!data.data,
-            dataLength: data.data ? data.data.length : 0,
-            dataPreview: data.data ? data.data.substring(0, 50) + '...' : 'none',
-            metadata: data.metadata
-        });
+        // Edge frames arrive as binary JSON, errors may still be text
+        const raw = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+        const data = JSON.parse(raw);
 
-        if (data.type === 'error') {
-            log(`Server Error: ${data.message}`, 'error');
-            return;
-        }
-
-        if (data.type === 'frame') {
-            processFrame(data);
+        // The edge coalesces queued messages into an array when we fall behind
+        if (Array.isArray(data)) {
+            data.forEach(dispatchMessage);
+        } else {
+            dispatchMessage(data);
         }
 
     } catch (e) {
@@ -225,21 +219,37 @@ function handleMessage(event) {
     }
 }
 
+function dispatchMessage(data) {
+    // DEBUG: Log received data structure
+    console.log('Received frame:', {
+        type: data.type,
+        hasData: !!data.data,
+        telemetry: data.data,
+        metadata: data.metadata
+    });
+
+    if (data.type === 'error') {
+        log(`Server Error: ${data.message}`, 'error');
+        return;
+    }
+
+    if (data.type === 'frame') {
+        processFrame(data);
+    }
+}
+
 // Frame Processing
 function processFrame(data) {
     try {
         const metadata = data.metadata || {};
-        const base64Data = data.data;
+        // Telemetry arrives as a plain JSON object inside the envelope
+        const telemetry = data.data;
 
-        if (!base64Data) {
+        if (!telemetry) {
             console.error('No frame data received');
             return;
         }
 
-        // Decode base64 to JSON string
-        const jsonString = atob(base64Data);
-        const telemetry = JSON.parse(jsonString);
-
         const isSynthesized = metadata.is_synthesized === true;
 
         try {
@@ -8,6 +8,7 @@ to receive and display verified video streams.
 import asyncio
 import json
 import os
+import sys
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
@@ -33,6 +34,9 @@ app.add_middleware(
 # Get the directory where this script is located
 STATIC_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Upper bound for a single message on the internal edge WebSocket hop
+WS_MAX_MESSAGE_SIZE = 2**22
+
 
 @app.get("/")
 async def root():
@@ -75,13 +79,17 @@ async def stream_to_client(websocket: WebSocket):
     edge_uri = f"ws://{edge_host}:8003/process"
     
     try:
-        async with websockets.connect(edge_uri) as edge_ws:
+        async with websockets.connect(edge_uri, compression=None, max_size=WS_MAX_MESSAGE_SIZE) as edge_ws:
             print("Connected to edge server")
             
             async for message in edge_ws:
                 try:
-                    # Forward message to browser
-                    await websocket.send_text(message)
+                    # Forward message to browser, keeping the edge's frame type
+                    # so binary frames skip the UTF-8 encode/validate pass
+                    if isinstance(message, bytes):
+                        await websocket.send_bytes(message)
+                    else:
+                        await websocket.send_text(message)
                 except Exception as e:
                     print(f"Error forwarding to browser: {e}")
                     break
@@ -103,4 +111,14 @@ async def stream_to_client(websocket: WebSocket):
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8004)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8004,
+        # uvloop has no Windows build; fall back to the stock loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=False,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
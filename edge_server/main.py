@@ -7,17 +7,19 @@ generates synthesized packets with confidence, and signs attestations.
 
 import asyncio
 import os
-import json
+import sys
 import time
 import base64
-from typing import Optional, List, Dict, Any
+import struct
+from typing import Optional, List, Dict, Any, Set, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 
 from nacl.signing import SigningKey, VerifyKey
-from nacl.encoding import Base64Encoder
 from nacl.exceptions import BadSignatureError
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+import orjson
 import uvicorn
 import websockets
 
@@ -37,10 +39,8 @@ app.add_middleware(
 
 # Edge signing key
 EDGE_SIGNING_KEY: Optional[SigningKey] = None
-
-# Frame buffer for prediction
-frame_buffer: List[Dict[str, Any]] = []
-MAX_BUFFER_SIZE = 10
+EDGE_PUBLIC_KEY_BYTES: Optional[bytes] = None
+EDGE_PUBLIC_KEY_B64: Optional[str] = None
 
 
 @dataclass
@@ -52,22 +52,50 @@ class PredictorConfig:
 
 config = PredictorConfig()
 
+# Viewers fed by the shared network pump, one bounded queue each
+SUBSCRIBER_QUEUE_SIZE = 64
+MAX_COALESCED_MESSAGES = 16
+subscribers: Set[asyncio.Queue] = set()
+network_pump_task: Optional[asyncio.Task] = None
+
+# Backoff bounds (seconds) for reconnecting to the network simulator
+RECONNECT_MIN_DELAY = 0.5
+RECONNECT_MAX_DELAY = 10.0
+
+# Upper bound for a single message on internal WebSocket hops
+WS_MAX_MESSAGE_SIZE = 2**22
+
 
 def init_edge_signing_key() -> SigningKey:
     """Initialize or load the edge server's Ed25519 signing key."""
-    global EDGE_SIGNING_KEY
+    global EDGE_SIGNING_KEY, EDGE_PUBLIC_KEY_BYTES, EDGE_PUBLIC_KEY_B64
     try:
         with open("edge_private_key.bin", "rb") as f:
             EDGE_SIGNING_KEY = SigningKey(f.read())
+        EDGE_PUBLIC_KEY_BYTES = bytes(EDGE_SIGNING_KEY.verify_key)
     except FileNotFoundError:
         EDGE_SIGNING_KEY = SigningKey.generate()
+        EDGE_PUBLIC_KEY_BYTES = bytes(EDGE_SIGNING_KEY.verify_key)
         with open("edge_private_key.bin", "wb") as f:
             f.write(bytes(EDGE_SIGNING_KEY))
         with open("edge_public_key.bin", "wb") as f:
-            f.write(bytes(EDGE_SIGNING_KEY.verify_key))
+            f.write(EDGE_PUBLIC_KEY_BYTES)
+    # The key never changes after startup, so extract and encode it once
+    EDGE_PUBLIC_KEY_B64 = base64.b64encode(EDGE_PUBLIC_KEY_BYTES).decode()
     return EDGE_SIGNING_KEY
 
 
+# Canonical signed layout for synthesized frames: the "synth:" domain tag,
+# then frame_id (u64), timestamp (f64), confidence (f32), parent count (u32),
+# followed by one u64 per parent frame id
+SYNTH_SIGN_PREFIX = b"synth:"
+SYNTH_FMT = struct.Struct("<QdfI")
+
+# Signed layout of origin frames, matching the sender: frame_id (u64),
+# timestamp (f64), payload length (u64)
+ORIGIN_FMT = struct.Struct("<QdQ")
+
+
 def sign_synthesized_frame(
     frame_data: bytes,
     frame_id: int,
@@ -79,28 +107,39 @@ def sign_synthesized_frame(
         init_edge_signing_key()
     
     timestamp = time.time()
-    message = f"synth:{frame_id}:{timestamp}:{confidence:.4f}:{parent_frame_ids}".encode()
-    signed = EDGE_SIGNING_KEY.sign(message, encoder=Base64Encoder)
+    parent_count = len(parent_frame_ids)
+    message = (
+        SYNTH_SIGN_PREFIX
+        + SYNTH_FMT.pack(frame_id, timestamp, confidence, parent_count)
+        + struct.pack(f"<{parent_count}Q", *parent_frame_ids)
+    )
+    # Sign raw bytes; Base64Encoder would also encode the echoed message
+    signed = EDGE_SIGNING_KEY.sign(message)
     
     return {
-        "frame_id": frame_id,
+        "frame_id": f"synth_{frame_id}",
         "timestamp": timestamp,
         "is_synthesized": True,
         "parent_frame_ids": parent_frame_ids,
         "confidence": confidence,
         "predictor_version": "linear_interp_v1",
-        "edge_signature": signed.signature.decode(),
-        "edge_public_key": base64.b64encode(bytes(EDGE_SIGNING_KEY.verify_key)).decode()
+        "edge_signature": base64.b64encode(signed.signature).decode(),
+        "edge_public_key": EDGE_PUBLIC_KEY_B64
     }
 
 
+@lru_cache(maxsize=16)
+def get_origin_verify_key(public_key_b64: str) -> VerifyKey:
+    """Decode a sender public key once; every frame from a sender repeats it."""
+    return VerifyKey(base64.b64decode(public_key_b64))
+
+
 def verify_origin_signature(metadata: dict, frame_size: int) -> bool:
     """Verify the origin sender's signature."""
     try:
-        public_key_bytes = base64.b64decode(metadata["public_key"])
-        verify_key = VerifyKey(public_key_bytes)
+        verify_key = get_origin_verify_key(metadata["public_key"])
         
-        message = f"{metadata['frame_id']}:{metadata['timestamp']}:{frame_size}".encode()
+        message = ORIGIN_FMT.pack(metadata["frame_id"], metadata["timestamp"], frame_size)
         signature = base64.b64decode(metadata["signature"])
         
         verify_key.verify(message, signature)
@@ -110,18 +149,11 @@ def verify_origin_signature(metadata: dict, frame_size: int) -> bool:
         return False
 
 
-def decode_frame_from_base64(data: str) -> dict:
-    """Decode JSON telemetry from base64 data."""
-    frame_bytes = base64.b64decode(data)
-    json_str = frame_bytes.decode('utf-8')
-    return json.loads(json_str)
-
-
-def encode_frame_to_base64(payload_dict: dict) -> str:
-    """Encode JSON telemetry to base64."""
-    json_str = json.dumps(payload_dict)
-    buffer = json_str.encode('utf-8')
-    return base64.b64encode(buffer).decode('utf-8')
+# Mock metric values for each whole-unit coordinate residue mod 5,
+# precomputed so the per-frame path is just two table lookups
+PSNR_LUT = tuple(round(min(50.0, 45.0 + i), 2) for i in range(5))
+SSIM_LUT = tuple(round(min(1.0, 0.95 + i / 100), 4) for i in range(5))
+FRAME_MATCH_LUT = tuple(round(min(100.0, 95.0 + i), 1) for i in range(5))
 
 
 def calculate_quality_metrics(synthesized: dict, reference: dict) -> dict:
@@ -130,66 +162,319 @@ def calculate_quality_metrics(synthesized: dict, reference: dict) -> dict:
     # We could calculate real error between synth.x and ref.x if we had them aligned,
     # but for typical linear motion, it will match almost perfectly.
     
-    psnr = 45.0 + (synthesized.get('rover_x', 0) % 5) # mock variation
-    ssim = 0.95 + (synthesized.get('rover_y', 0) % 5) / 100 
-    frame_match = 95.0 + (synthesized.get('rover_x', 0) % 5)
+    x_bucket = int(synthesized.get('rover_x', 0)) % 5  # mock variation
+    y_bucket = int(synthesized.get('rover_y', 0)) % 5
     
     return {
-        "psnr": round(min(50.0, psnr), 2),
-        "ssim": round(min(1.0, ssim), 4),
-        "frame_match": round(min(100.0, frame_match), 1)
+        "psnr": PSNR_LUT[x_bucket],
+        "ssim": SSIM_LUT[y_bucket],
+        "frame_match": FRAME_MATCH_LUT[x_bucket]
     }
 
 
-def interpolate_frames(
-    frame1: dict,
-    frame2: dict,
-    num_interpolated: int = 2
-) -> List[tuple]:
+def advance_prediction(
+    predicted_x: float,
+    predicted_y: float,
+    velocity_x: float,
+    velocity_y: float,
+    true_x: float,
+    true_y: float,
+    dt: float,
+    correction_active: bool
+) -> Tuple[float, float, bool]:
     """
-    Interpolate telemetry frames using simple linear interpolation.
-    Returns list of (interpolated_dict, confidence) tuples.
+    Advance the predicted position by one 30 FPS tick.
+    Returns (predicted_x, predicted_y, correction_active).
     """
-    interpolated = []
+    # Extrapolate if stale (>50ms)
+    if dt > 0.05:
+        predicted_x += velocity_x
+        predicted_y += velocity_y
+    
+    # Soft correction (damping) towards true position if we just received a packet
+    if correction_active:
+        diff_x = true_x - predicted_x
+        diff_y = true_y - predicted_y
+        
+        # Move 10% of the distance per frame (smooth easing)
+        predicted_x += diff_x * 0.1
+        predicted_y += diff_y * 0.1
+        
+        # Turn off correction if we are close enough
+        if abs(diff_x) < 1.0 and abs(diff_y) < 1.0:
+            correction_active = False
+    
+    return predicted_x, predicted_y, correction_active
+
+
+def new_predictor_state() -> Dict[str, Any]:
+    """Create the state shared between the receiver and predictor tasks."""
+    return {
+        "active": True,
+        "latest_real_frame": None,
+        "predicted_x": 0.0,
+        "predicted_y": 0.0,
+        "true_x": 0.0,
+        "true_y": 0.0,
+        "velocity_x": 2.0,  # Default sender linear speed
+        "velocity_y": 0.0,
+        "last_update_time": time.monotonic(),
+        "origin_verified": False,
+        "correction_active": False
+    }
+
+
+def broadcast(message: bytes) -> None:
+    """Fan a serialized message out to every connected viewer."""
+    for queue in subscribers:
+        if queue.full():
+            # Slow viewer: drop its oldest message rather than stall the pump
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+def forward_real_frame(data: dict, metadata: dict, curr_frame: dict, origin_verified: bool) -> None:
+    """Forward a real frame to viewers, annotating the already-parsed message."""
+    metadata["origin_verified"] = origin_verified
+    metadata["is_synthesized"] = False
+    data["metadata"] = metadata
+    data["data"] = curr_frame
+    data.setdefault("network_metadata", {})
+    broadcast(orjson.dumps(data))
+
+
+def ingest_real_frame(data: dict, state: Dict[str, Any]) -> None:
+    """Verify a real frame, update predictor state and forward it to viewers."""
+    metadata = data.get("metadata", {})
+    curr_frame = data.get("data") or {}
+    
+    origin_verified = verify_origin_signature(metadata, metadata.get("frame_size", 0))
     
-    x1, y1 = frame1.get('rover_x', 0), frame1.get('rover_y', 0)
-    x2, y2 = frame2.get('rover_x', 0), frame2.get('rover_y', 0)
+    # Jitter reorders packets in flight. A frame older than the one
+    # we already track is still shown, but must not drag the
+    # prediction backwards
+    latest = state["latest_real_frame"]
+    if latest and metadata.get("frame_id", 0) <= latest["metadata"].get("frame_id", 0):
+        forward_real_frame(data, metadata, curr_frame, origin_verified)
+        return
     
-    state = frame2.get('state', "unknown")
-    battery = frame2.get('battery', 100)
-    temperature = frame2.get('temperature', -60)
+    # Update true positions and velocity
+    curr_x = curr_frame.get("rover_x", 0)
+    curr_y = curr_frame.get("rover_y", 0)
     
-    for i in range(1, num_interpolated + 1):
-        alpha = i / (num_interpolated + 1)
+    if state["latest_real_frame"]:
+        prev_frame = state["latest_real_frame"]["frame"]
+        prev_x = prev_frame.get("rover_x", 0)
         
-        # Linear interp coordinates
-        interp_x = x1 + (x2 - x1) * alpha
-        interp_y = y1 + (y2 - y1) * alpha
+        # Guess velocity direction, sender moves at fixed absolute speed of 2.0
+        # But observed over time, if curr < prev we are returning
+        # Handle the period turnover boundary gracefully
+        if abs(curr_x - prev_x) < 400: # not a wrap-around
+            if curr_x >= prev_x:
+                state["velocity_x"] = 2.0
+            else:
+                state["velocity_x"] = -2.0
+    else:
+        # First frame init
+        state["predicted_x"] = curr_x
+        state["predicted_y"] = curr_y
         
-        blended = {
-            "rover_x": interp_x,
-            "rover_y": interp_y,
-            "state": state,
-            "battery": battery,
-            "temperature": temperature
-        }
+    # PROJECT true state forward to "NOW" to compensate for network delay!
+    # Wall clock, because it is compared with the sender's timestamp
+    received_at = time.time()
+    sender_timestamp = metadata.get("timestamp", received_at)
+    # Ensure age is not negative due to clock skew
+    age_seconds = max(0.0, received_at - sender_timestamp)
+    frames_elapsed = age_seconds * 30.0
+    
+    # Our best guess of where the rover is *right now* based on this stale packet
+    now_x = curr_x + (state["velocity_x"] * frames_elapsed)
+    now_y = curr_y + (state["velocity_y"] * frames_elapsed)
+    
+    state["true_x"] = now_x
+    state["true_y"] = now_y
+    state["correction_active"] = True # Start soft-snapping to the projected 'NOW' position
+    
+    state["last_update_time"] = time.monotonic()
+    state["origin_verified"] = origin_verified
+    state["latest_real_frame"] = {
+        "frame": curr_frame,
+        "metadata": metadata
+    }
+    
+    forward_real_frame(data, metadata, curr_frame, origin_verified)
+
+
+async def receiver_task(network_ws, state: Dict[str, Any]):
+    """Consume real frames from the network simulator and update predictor state."""
+    try:
+        async for message in network_ws:
+            if not state["active"]:
+                break
+                
+            # Frames may arrive as text or binary; orjson takes either as-is
+            data = orjson.loads(message)
+            if data.get("type") == "error":
+                broadcast(message if isinstance(message, bytes) else message.encode())
+                continue
+                
+            if data.get("type") == "batch":
+                # The sender groups small frames into one message; the
+                # simulator's delay applies to the whole batch
+                network_metadata = data.get("network_metadata")
+                for frame in data.get("frames", []):
+                    if network_metadata is not None:
+                        frame.setdefault("network_metadata", network_metadata)
+                    ingest_real_frame(frame, state)
+                continue
+                
+            if data.get("type") != "frame":
+                continue
+                
+            ingest_real_frame(data, state)
+            
+    finally:
+        state["active"] = False
+
+
+async def predictor_task(state: Dict[str, Any]):
+    """Emit a steady 30 FPS stream of signed synthesized frames."""
+    synth_count = 0
+    frame_interval = 1 / 30
+    next_tick = time.monotonic()
+    try:
+        while state["active"]:
+            # Run steady 30 FPS to mask any network delays. Sleep only for
+            # the slack left in this period so per-tick work does not drift
+            # the rate; resync instead of bursting if we fell far behind.
+            next_tick += frame_interval
+            now = time.monotonic()
+            if next_tick < now - frame_interval:
+                next_tick = now
+            await asyncio.sleep(max(0.0, next_tick - now))
+            
+            if not state["latest_real_frame"]:
+                continue  # Wait for first real packet
+                
+            dt = time.monotonic() - state["last_update_time"]
+            
+            (
+                state["predicted_x"],
+                state["predicted_y"],
+                state["correction_active"]
+            ) = advance_prediction(
+                state["predicted_x"], state["predicted_y"],
+                state["velocity_x"], state["velocity_y"],
+                state["true_x"], state["true_y"],
+                dt, state["correction_active"]
+            )
+            
+            if not subscribers:
+                continue  # Keep tracking, but nobody is watching: skip signing
+                    
+            real_data = state["latest_real_frame"]
+            real_frame = real_data["frame"]
+            
+            interp_frame = {
+                "rover_x": state["predicted_x"],
+                "rover_y": state["predicted_y"],
+                "state": real_frame.get("state", "extrapolating"),
+                "battery": real_frame.get("battery", 100),
+                "temperature": real_frame.get("temperature", -60)
+            }
+            
+            synth_count += 1
+            confidence = max(0.1, 1.0 - (dt / 2.0))
+            
+            quality_metrics = calculate_quality_metrics(interp_frame, real_frame)
+            frame_bytes = orjson.dumps(interp_frame)
+            parent_id = real_data["metadata"].get("frame_id", 0)
+            
+            synth_metadata = sign_synthesized_frame(
+                frame_bytes, synth_count, [parent_id], confidence
+            )
+            
+            synth_output_metadata = {
+                **synth_metadata,
+                "origin_verified": state["origin_verified"],
+                "psnr": quality_metrics["psnr"],
+                "ssim": quality_metrics["ssim"],
+                "frame_match": quality_metrics["frame_match"]
+            }
+            # Splice the already-serialized payload into the envelope
+            # rather than serializing interp_frame a second time
+            broadcast(
+                b'{"type":"frame","metadata":' + orjson.dumps(synth_output_metadata)
+                + b',"data":' + frame_bytes + b'}'
+            )
+            
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        print(f"Predictor error: {e}")
+    finally:
+        state["active"] = False
+
+
+async def network_pump():
+    """
+    Hold one persistent connection to the network simulator, run the
+    predictor on it and broadcast both streams to every viewer.
+    Reconnects with exponential backoff when the upstream drops.
+    """
+    network_host = os.environ.get("NETWORK_SIMULATOR_HOST", "localhost")
+    network_uri = f"ws://{network_host}:8002/proxy"
+    retry_delay = RECONNECT_MIN_DELAY
+    
+    while True:
+        state = new_predictor_state()
+        try:
+            async with websockets.connect(network_uri, compression=None, max_size=WS_MAX_MESSAGE_SIZE) as network_ws:
+                print("Connected to network simulator")
+                predictor = asyncio.create_task(predictor_task(state))
+                try:
+                    await receiver_task(network_ws, state)
+                finally:
+                    state["active"] = False
+                    predictor.cancel()
+        except websockets.exceptions.WebSocketException as e:
+            print(f"Receiver WebSocket error: {e}")
+        except ConnectionRefusedError:
+            print("Could not connect to network simulator")
+            broadcast(orjson.dumps({
+                "type": "error",
+                "message": "Could not connect to network simulator"
+            }))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Receiver error: {e}")
         
-        # Confidence based on jump distance
-        dist = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
-        # Lower confidence if jump is suspiciously large
-        confidence = max(0.5, min(0.98, 1.0 - dist / 500))
+        # A handshake alone proves nothing: with the sender down the
+        # simulator accepts, reports an error and closes. Only a session
+        # that delivered real frames resets the backoff.
+        if state["latest_real_frame"]:
+            retry_delay = RECONNECT_MIN_DELAY
         
-        interpolated.append((blended, confidence))
-    
-    return interpolated
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, RECONNECT_MAX_DELAY)
 
 
 @app.on_event("startup")
 async def startup():
-    """Initialize edge signing key on startup."""
+    """Initialize edge signing key and start the upstream pump on startup."""
+    global network_pump_task
     init_edge_signing_key()
     print("Edge server initialized with signing key")
-    print(f"Edge public key: {base64.b64encode(bytes(EDGE_SIGNING_KEY.verify_key)).decode()}")
+    print(f"Edge public key: {EDGE_PUBLIC_KEY_B64}")
+    network_pump_task = asyncio.create_task(network_pump())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the upstream pump."""
+    if network_pump_task is not None:
+        network_pump_task.cancel()
 
 
 @app.get("/")
@@ -198,8 +483,8 @@ async def root():
     return {
         "component": "edge_server",
         "status": "running",
-        "buffer_size": len(frame_buffer),
-        "edge_public_key": base64.b64encode(bytes(EDGE_SIGNING_KEY.verify_key)).decode() if EDGE_SIGNING_KEY else None
+        "viewers": len(subscribers),
+        "edge_public_key": EDGE_PUBLIC_KEY_B64
     }
 
 
@@ -209,218 +494,58 @@ async def get_public_key():
     if EDGE_SIGNING_KEY is None:
         init_edge_signing_key()
     return {
-        "edge_public_key": base64.b64encode(bytes(EDGE_SIGNING_KEY.verify_key)).decode()
+        "edge_public_key": EDGE_PUBLIC_KEY_B64
     }
 
 
 @app.websocket("/process")
 async def process_stream(websocket: WebSocket):
     """
-    WebSocket endpoint that receives frames from network simulator,
-    runs a continuous prediction loop to mask jitter, and forwards 
-    the enhanced stream to the client.
+    WebSocket endpoint that streams the shared predictor output
+    (real frames plus the continuous 30 FPS synthesized stream)
+    to a single viewer.
     """
     await websocket.accept()
     print("Edge processing connection established")
     
-    network_host = os.environ.get("NETWORK_SIMULATOR_HOST", "localhost")
-    network_uri = f"ws://{network_host}:8002/proxy"
-    
-    # State shared between receiver and predictor tasks
-    state = {
-        "active": True,
-        "latest_real_frame": None,
-        "predicted_x": 0.0,
-        "predicted_y": 0.0,
-        "true_x": 0.0,
-        "true_y": 0.0,
-        "velocity_x": 2.0,  # Default sender linear speed
-        "velocity_y": 0.0,
-        "last_update_time": time.time(),
-        "origin_verified": False,
-        "correction_active": False
-    }
-    
-    async def receiver_task():
-        try:
-            async with websockets.connect(network_uri) as network_ws:
-                print("Connected to network simulator")
-                async for message in network_ws:
-                    if not state["active"]:
-                        break
-                        
-                    data = json.loads(message)
-                    if data.get("type") == "error":
-                        await websocket.send_json(data)
-                        continue
-                        
-                    if data.get("type") != "frame":
-                        continue
-                        
-                    metadata = data.get("metadata", {})
-                    frame_data = data.get("data", "")
-                    
-                    origin_verified = verify_origin_signature(metadata, metadata.get("frame_size", 0))
-                    curr_frame = decode_frame_from_base64(frame_data)
-                    
-                    # Update true positions and velocity
-                    curr_x = curr_frame.get("rover_x", 0)
-                    curr_y = curr_frame.get("rover_y", 0)
-                    
-                    if state["latest_real_frame"]:
-                        prev_frame = state["latest_real_frame"]["frame"]
-                        prev_x = prev_frame.get("rover_x", 0)
-                        
-                        # Guess velocity direction, sender moves at fixed absolute speed of 2.0
-                        # But observed over time, if curr < prev we are returning
-                        # Handle the period turnover boundary gracefully
-                        if abs(curr_x - prev_x) < 400: # not a wrap-around
-                            if curr_x >= prev_x:
-                                state["velocity_x"] = 2.0
-                            else:
-                                state["velocity_x"] = -2.0
-                    else:
-                        # First frame init
-                        state["predicted_x"] = curr_x
-                        state["predicted_y"] = curr_y
-                        
-                    # PROJECT true state forward to "NOW" to compensate for network delay!
-                    sender_timestamp = metadata.get("timestamp", time.time())
-                    # Ensure age is not negative due to clock skew
-                    age_seconds = max(0.0, time.time() - sender_timestamp) 
-                    frames_elapsed = age_seconds * 30.0
-                    
-                    # Our best guess of where the rover is *right now* based on this stale packet
-                    now_x = curr_x + (state["velocity_x"] * frames_elapsed)
-                    now_y = curr_y + (state["velocity_y"] * frames_elapsed)
-                    
-                    state["true_x"] = now_x
-                    state["true_y"] = now_y
-                    state["correction_active"] = True # Start soft-snapping to the projected 'NOW' position
-                    
-                    state["last_update_time"] = time.time()
-                    state["origin_verified"] = origin_verified
-                    state["latest_real_frame"] = {
-                        "frame": curr_frame,
-                        "metadata": metadata
-                    }
-                    
-                    # Forward original frame to client
-                    original_output = {
-                        "type": "frame",
-                        "metadata": {
-                            **metadata,
-                            "origin_verified": origin_verified,
-                            "is_synthesized": False
-                        },
-                        "data": frame_data,
-                        "network_metadata": data.get("network_metadata", {})
-                    }
-                    await websocket.send_json(original_output)
-                    
-        except websockets.exceptions.WebSocketException as e:
-            print(f"Receiver WebSocket error: {e}")
-        except ConnectionRefusedError:
-            print("Could not connect to network simulator")
-            await websocket.send_json({
-                "type": "error",
-                "message": "Could not connect to network simulator"
-            })
-        except Exception as e:
-            print(f"Receiver error: {e}")
-        finally:
-            state["active"] = False
-
-
-    async def predictor_task():
-        synth_count = 0
-        try:
-            while state["active"]:
-                # Run steady 30 FPS to mask any network delays
-                await asyncio.sleep(1/30)
-                
-                if not state["latest_real_frame"]:
-                    continue  # Wait for first real packet
-                    
-                dt = time.time() - state["last_update_time"]
-                
-                # Extrapolate if stale (>50ms)
-                if dt > 0.05:
-                    state["predicted_x"] += state["velocity_x"]
-                    state["predicted_y"] += state["velocity_y"]
-                
-                # Soft correction (damping) towards true position if we just received a packet
-                if state["correction_active"]:
-                    diff_x = state["true_x"] - state["predicted_x"]
-                    diff_y = state["true_y"] - state["predicted_y"]
-                    
-                    # Move 10% of the distance per frame (smooth easing)
-                    state["predicted_x"] += diff_x * 0.1
-                    state["predicted_y"] += diff_y * 0.1
-                    
-                    # Turn off correction if we are close enough
-                    if abs(diff_x) < 1.0 and abs(diff_y) < 1.0:
-                        state["correction_active"] = False
-                        
-                real_data = state["latest_real_frame"]
-                real_frame = real_data["frame"]
-                
-                interp_frame = {
-                    "rover_x": state["predicted_x"],
-                    "rover_y": state["predicted_y"],
-                    "state": real_frame.get("state", "extrapolating"),
-                    "battery": real_frame.get("battery", 100),
-                    "temperature": real_frame.get("temperature", -60)
-                }
-                
-                synth_count += 1
-                synth_id = f"synth_{synth_count}"
-                confidence = max(0.1, 1.0 - (dt / 2.0))
-                
-                quality_metrics = calculate_quality_metrics(interp_frame, real_frame)
-                encoded_synth_data = encode_frame_to_base64(interp_frame)
-                frame_bytes = base64.b64decode(encoded_synth_data)
-                parent_id = real_data["metadata"].get("frame_id", 0)
-                
-                synth_metadata = sign_synthesized_frame(
-                    frame_bytes, synth_id, [parent_id], confidence
-                )
-                
-                synth_output = {
-                    "type": "frame",
-                    "metadata": {
-                        **synth_metadata,
-                        "origin_verified": state["origin_verified"],
-                        "psnr": quality_metrics["psnr"],
-                        "ssim": quality_metrics["ssim"],
-                        "frame_match": quality_metrics["frame_match"]
-                    },
-                    "data": encoded_synth_data
-                }
-                await websocket.send_json(synth_output)
-                
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            print(f"Predictor error: {e}")
-        finally:
-            state["active"] = False
-
-
-    # Run both loops concurrently
-    t1 = asyncio.create_task(receiver_task())
-    t2 = asyncio.create_task(predictor_task())
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    subscribers.add(queue)
     
     try:
-        await asyncio.gather(t1, t2)
+        while True:
+            message = await queue.get()
+            if queue.empty():
+                await websocket.send_bytes(message)
+                continue
+            
+            # The viewer fell behind and more messages are already queued:
+            # coalesce them into one JSON array instead of one send each
+            batch = [message]
+            while not queue.empty() and len(batch) < MAX_COALESCED_MESSAGES:
+                batch.append(queue.get_nowait())
+            await websocket.send_bytes(b"[" + b",".join(batch) + b"]")
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         print(f"Process stream error: {e}")
     finally:
-        state["active"] = False
-        t1.cancel()
-        t2.cancel()
+        subscribers.discard(queue)
         print("Edge processing client disconnected")
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    # Single process on purpose: the upstream pump, predictor and
+    # subscriber set are shared per process, so extra workers would each
+    # open their own simulator/sender stream
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8003,
+        # uvloop has no Windows build; fall back to the stock loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=False,
+        # Explicit, or uvicorn would take the count from WEB_CONCURRENCY
+        workers=1
+    )
@@ -6,13 +6,15 @@ to emulate Earth-Mars communication characteristics.
 """
 
 import asyncio
-import json
+import heapq
 import os
-import random
+import sys
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict
 
+import numpy as np
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -45,6 +47,20 @@ class NetworkConfig:
 # Default configuration
 config = NetworkConfig()
 
+# Serializable copy of the configuration attached to every forwarded
+# packet; refreshed by update_config instead of asdict() per packet
+_config_snapshot: Dict[str, Any] = asdict(config)
+
+# Pre-sampled delay/loss decisions, refilled in bulk and discarded
+# whenever the configuration changes
+RANDOM_POOL_SIZE = 4096
+_rng = np.random.default_rng()
+_delay_pool: List[float] = []
+_loss_pool: List[bool] = []
+
+# Upper bound for a single message on internal WebSocket hops
+WS_MAX_MESSAGE_SIZE = 2**22
+
 # Metrics tracking
 metrics: Dict[str, Any] = {
     "packets_forwarded": 0,
@@ -79,7 +95,7 @@ async def update_config(
     bandwidth_limit_kbps: Optional[int] = None
 ):
     """Update network simulation configuration."""
-    global config
+    global config, _config_snapshot
     if base_delay_ms is not None:
         config.base_delay_ms = base_delay_ms
     if jitter_ms is not None:
@@ -89,7 +105,12 @@ async def update_config(
     if bandwidth_limit_kbps is not None:
         config.bandwidth_limit_kbps = bandwidth_limit_kbps
     
-    return {"status": "updated", "config": asdict(config)}
+    # Samples drawn under the old settings no longer apply
+    _delay_pool.clear()
+    _loss_pool.clear()
+    _config_snapshot = asdict(config)
+    
+    return {"status": "updated", "config": _config_snapshot}
 
 
 @app.get("/metrics")
@@ -119,13 +140,18 @@ async def reset_metrics():
 
 def calculate_delay() -> float:
     """Calculate delay with jitter."""
-    jitter = random.uniform(-config.jitter_ms, config.jitter_ms)
-    return max(0, config.base_delay_ms + jitter) / 1000.0
+    if not _delay_pool:
+        # Sample a whole pool of delays (in seconds) in one vectorized call
+        jitter = _rng.uniform(-config.jitter_ms, config.jitter_ms, RANDOM_POOL_SIZE)
+        _delay_pool.extend((np.maximum(0, config.base_delay_ms + jitter) / 1000.0).tolist())
+    return _delay_pool.pop()
 
 
 def should_drop_packet() -> bool:
     """Determine if packet should be dropped based on loss rate."""
-    return random.random() < config.packet_loss_rate
+    if not _loss_pool:
+        _loss_pool.extend((_rng.random(RANDOM_POOL_SIZE) < config.packet_loss_rate).tolist())
+    return _loss_pool.pop()
 
 
 @app.websocket("/proxy")
@@ -142,11 +168,22 @@ async def proxy_connection(websocket: WebSocket):
     sender_uri = f"ws://{sender_host}:8001/stream"
     
     try:
-        async with websockets.connect(sender_uri) as sender_ws:
+        # The heap scheduler reads every sender packet as soon as it lands,
+        # so the receive queue never needs to push back on the sender
+        async with websockets.connect(
+            sender_uri, compression=None, max_size=WS_MAX_MESSAGE_SIZE, max_queue=None
+        ) as sender_ws:
             print("Connected to sender")
             
-            async def forward_with_delay():
-                """Forward messages from sender to client with delay."""
+            # Packets in flight, ordered by release time:
+            # (release_time, seq, delay, message). seq breaks ties so
+            # messages themselves are never compared.
+            in_flight: List[tuple] = []
+            packet_arrived = asyncio.Event()
+            
+            async def enqueue_with_delay():
+                """Stamp each sender packet with its release time."""
+                seq = 0
                 async for message in sender_ws:
                     # Check for packet loss
                     if should_drop_packet():
@@ -154,24 +191,48 @@ async def proxy_connection(websocket: WebSocket):
                         print(f"Packet dropped (simulated loss)")
                         continue
                     
-                    # Calculate and apply delay
+                    # Calculate delay; the packet waits in the heap, not here,
+                    # so the next one is read immediately
                     delay = calculate_delay()
-                    await asyncio.sleep(delay)
+                    heapq.heappush(in_flight, (time.monotonic() + delay, seq, delay, message))
+                    seq += 1
+                    packet_arrived.set()
+            
+            async def forward_with_delay():
+                """Forward every in-flight packet once its delay has elapsed."""
+                while True:
+                    if not in_flight:
+                        packet_arrived.clear()
+                        await packet_arrived.wait()
+                        continue
+                    
+                    wait = in_flight[0][0] - time.monotonic()
+                    if wait > 0:
+                        # Sleep until the earliest release, but wake early if a
+                        # newly arrived packet drew a shorter delay
+                        packet_arrived.clear()
+                        try:
+                            await asyncio.wait_for(packet_arrived.wait(), wait)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+                    
+                    _, _, delay, message = heapq.heappop(in_flight)
                     
-                    # Parse message to add network metadata
-                    try:
-                        data = json.loads(message)
-                        data["network_metadata"] = {
+                    # Splice network metadata into the JSON object without
+                    # parsing the frame: drop its closing brace and append
+                    if isinstance(message, str):
+                        message = message.encode()
+                    if message.endswith(b"}") and len(message) > 2:
+                        network_metadata = orjson.dumps({
                             "simulated_delay_ms": delay * 1000,
                             "proxy_timestamp": time.time(),
-                            "config": asdict(config)
-                        }
-                        message = json.dumps(data)
-                    except json.JSONDecodeError:
-                        pass
+                            "config": _config_snapshot
+                        })
+                        message = message[:-1] + b',"network_metadata":' + network_metadata + b"}"
                     
                     # Forward message
-                    await websocket.send_text(message)
+                    await websocket.send_bytes(message)
                     
                     # Update metrics
                     metrics["packets_forwarded"] += 1
@@ -184,7 +245,17 @@ async def proxy_connection(websocket: WebSocket):
                         (1 - alpha) * metrics["avg_delay_ms"]
                     )
             
-            await forward_with_delay()
+            tasks = [
+                asyncio.create_task(enqueue_with_delay()),
+                asyncio.create_task(forward_with_delay())
+            ]
+            try:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            for task in done:
+                task.result()  # Surface errors to the handlers below
             
     except websockets.exceptions.WebSocketException as e:
         print(f"WebSocket error: {e}")
@@ -245,4 +316,15 @@ async def forward_to_edge(websocket: WebSocket):
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8002,
+        # uvloop has no Windows build; fall back to the stock loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=False,
+        # Explicit, or uvicorn would take the count from WEB_CONCURRENCY
+        workers=1
+    )
@@ -4,6 +4,9 @@ import time
 import sys
 import os
 import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Define the components and their ports
 components = [
@@ -15,6 +18,14 @@ components = [
 
 processes = []
 
+# Set on shutdown so readiness probes still running in the launch pool
+# stop early instead of polling out their full timeout
+shutting_down = threading.Event()
+
+# Readiness probing: how long to wait for each port, and how often to poll
+READY_TIMEOUT = 5.0
+READY_POLL_INTERVAL = 0.02
+
 def start_component(component):
     """Start a component in a new process."""
     print(f"🚀 Starting {component['name']} on port {component['port']}...")
@@ -54,37 +65,74 @@ def start_component(component):
         print(f"❌ Failed to start {component['name']}: {e}")
         return None
 
+def wait_until_ready(component, proc):
+    """Poll the component's port until it accepts TCP connections."""
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline and not shutting_down.is_set():
+        if proc.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("127.0.0.1", component['port']), timeout=0.05):
+                return True
+        except OSError:
+            time.sleep(READY_POLL_INTERVAL)
+    return False
+
+
+def launch(component):
+    """Start a component and block until its port is open (or timeout)."""
+    proc = start_component(component)
+    if proc is None:
+        return None
+    # Record it right away so an interrupt during startup still stops it
+    processes.append((component, proc))
+    if wait_until_ready(component, proc):
+        print(f"✔️  {component['name']} ready on port {component['port']}")
+    elif not shutting_down.is_set():
+        print(f"⚠️  {component['name']} not listening on port {component['port']} after {READY_TIMEOUT:.0f}s")
+    return proc
+
+
 def main():
     print("=" * 50)
     print("🌍 Interplanetary Network Demo Runner")
     print("=" * 50)
     
-    # Start all components
-    for comp in components:
-        proc = start_component(comp)
-        if proc:
-            processes.append(proc)
-        time.sleep(1) # Wait a bit between starts
-        
-    print("\n✅ All components started!")
-    print("👉 Open your browser at: http://localhost:8004")
-    print("Press Ctrl+C to stop all components.\n")
-    
+    # Start all components in parallel; downstream ones retry their
+    # upstream connections, so start order does not matter
+    pool = ThreadPoolExecutor(max_workers=len(components))
     try:
+        for _ in pool.map(launch, components):
+            pass
+            
+        print("\n✅ All components started!")
+        print("👉 Open your browser at: http://localhost:8004")
+        print("Press Ctrl+C to stop all components.\n")
+        
         # Keep main thread alive
         while True:
             time.sleep(1)
             # Check if processes are alive
-            for i, proc in enumerate(processes):
+            for comp, proc in processes:
                 if proc.poll() is not None:
-                    print(f"⚠️  {components[i]['name']} stopped unexpectedly!")
+                    print(f"⚠️  {comp['name']} stopped unexpectedly!")
                     # Optional: restart logic
                     
     except KeyboardInterrupt:
         print("\n🛑 Stopping all components...")
-        for proc in processes:
-            proc.terminate()
-            # Windows might typically need kill, but try terminate first
+    finally:
+        # Let any in-flight launches finish recording their process first
+        shutting_down.set()
+        pool.shutdown(wait=True)
+        for _, proc in processes:
+            if proc.poll() is None:
+                proc.terminate()
+                # Windows might typically need kill, but try terminate first
+        for _, proc in processes:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
         print("Goodbye!")
 
 if __name__ == "__main__":
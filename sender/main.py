@@ -6,16 +6,15 @@ Signs telemetry data with Ed25519 and streams via WebSocket.
 """
 
 import asyncio
-import json
 import time
 import base64
-import os
-import math
+import struct
+import sys
 from pathlib import Path
 from typing import Optional
 
 from nacl.signing import SigningKey
-from nacl.encoding import Base64Encoder
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -36,11 +35,23 @@ app.add_middleware(
 
 # Configuration
 SIGNING_KEY: Optional[SigningKey] = None
+PUBLIC_KEY_BYTES: Optional[bytes] = None
+PUBLIC_KEY_B64: Optional[str] = None
 SOURCE_TYPE = "telemetry"
 
+# Telemetry frames are ~100 bytes, so each one is dwarfed by its own
+# WebSocket/TCP framing. Send them in batches of up to BATCH_SIZE,
+# flushing early once the oldest queued frame is BATCH_MAX_AGE old.
+BATCH_SIZE = 5
+BATCH_MAX_AGE = 0.15
+
+# Signed layout for each frame: frame_id (u64), timestamp (f64) and
+# payload length (u64). The edge server verifies the same layout.
+FRAME_SIGN_FMT = struct.Struct("<QdQ")
+
 def init_signing_key() -> SigningKey:
     """Initialize or load the Ed25519 signing key."""
-    global SIGNING_KEY
+    global SIGNING_KEY, PUBLIC_KEY_BYTES, PUBLIC_KEY_B64
     key_path = Path(__file__).parent / "sender_private_key.bin"
     pub_key_path = Path(__file__).parent / "sender_public_key.bin"
     
@@ -53,22 +64,23 @@ def init_signing_key() -> SigningKey:
             f.write(bytes(SIGNING_KEY))
         with open(pub_key_path, "wb") as f:
             f.write(bytes(SIGNING_KEY.verify_key))
+    
+    # The key never changes after this, so encode it once
+    PUBLIC_KEY_BYTES = bytes(SIGNING_KEY.verify_key)
+    PUBLIC_KEY_B64 = base64.b64encode(PUBLIC_KEY_BYTES).decode()
     return SIGNING_KEY
 
 
 def sign_frame_data(frame_data: bytes, frame_id: int, timestamp: float) -> dict:
     """Sign frame data and create metadata."""
-    if SIGNING_KEY is None:
-        init_signing_key()
-    
-    message = f"{frame_id}:{timestamp}:{len(frame_data)}".encode()
-    signed = SIGNING_KEY.sign(message, encoder=Base64Encoder)
+    message = FRAME_SIGN_FMT.pack(frame_id, timestamp, len(frame_data))
+    signature = SIGNING_KEY.sign(message).signature
     
     return {
         "frame_id": frame_id,
         "timestamp": timestamp,
-        "signature": signed.signature.decode(),
-        "public_key": base64.b64encode(bytes(SIGNING_KEY.verify_key)).decode(),
+        "signature": base64.b64encode(signature).decode(),
+        "public_key": PUBLIC_KEY_B64,
         "is_keyframe": True
     }
 
@@ -105,7 +117,7 @@ async def startup():
     print("=" * 50)
     print("Mars Emulator (Telemetry) - Sender Started")
     print("=" * 50)
-    print(f"Public key: {base64.b64encode(bytes(SIGNING_KEY.verify_key)).decode()[:32]}...")
+    print(f"Public key: {PUBLIC_KEY_B64[:32]}...")
     print("=" * 50)
 
 
@@ -116,7 +128,7 @@ async def root():
         "component": "sender",
         "status": "running",
         "source_type": SOURCE_TYPE,
-        "public_key": base64.b64encode(bytes(SIGNING_KEY.verify_key)).decode() if SIGNING_KEY else None
+        "public_key": PUBLIC_KEY_B64
     }
 
 
@@ -126,7 +138,7 @@ async def get_public_key():
     if SIGNING_KEY is None:
         init_signing_key()
     return {
-        "public_key": base64.b64encode(bytes(SIGNING_KEY.verify_key)).decode()
+        "public_key": PUBLIC_KEY_B64
     }
 
 
@@ -138,13 +150,16 @@ async def stream_video(websocket: WebSocket):
     
     frame_id = 0
     keyframe_interval = 30
+    frame_interval = 1 / 30
+    start = time.monotonic()
+    batch = []
+    batch_started = 0.0
     
     try:
         while True:
             # Generate telemetry
             payload = generate_telemetry_payload(frame_id)
-            payload_json = json.dumps(payload)
-            payload_bytes = payload_json.encode('utf-8')
+            payload_bytes = orjson.dumps(payload)
             
             # Create metadata and sign
             timestamp = time.time()
@@ -155,19 +170,32 @@ async def stream_video(websocket: WebSocket):
             metadata["frame_size"] = len(payload_bytes)
             metadata["source_type"] = SOURCE_TYPE
             
-            # Send frame
-            await websocket.send_json({
-                "type": "frame",
-                "metadata": metadata,
-                # Encode telemetry data as base64 to match the existing expected structure, 
-                # or just send it as a string. Base64 is safer for existing proxies.
-                "data": base64.b64encode(payload_bytes).decode('utf-8')
-            })
+            # Queue frame, embedding the already-serialized telemetry as a
+            # plain JSON object; base64 only inflated it by a third
+            if not batch:
+                batch_started = time.monotonic()
+            batch.append(
+                b'{"type":"frame","metadata":' + orjson.dumps(metadata)
+                + b',"data":' + payload_bytes + b'}'
+            )
+            
+            if len(batch) >= BATCH_SIZE or time.monotonic() - batch_started >= BATCH_MAX_AGE:
+                await websocket.send_bytes(b'{"type":"batch","frames":[' + b",".join(batch) + b']}')
+                batch.clear()
             
             frame_id += 1
             
-            # Control frame rate (~30 FPS for smooth playback)
-            await asyncio.sleep(1/30)
+            # Control frame rate (~30 FPS for smooth playback). Frame n is
+            # due at start + n periods, so time spent signing and sending
+            # does not accumulate as drift.
+            now = time.monotonic()
+            next_tick = start + frame_id * frame_interval
+            if now - next_tick > frame_interval:
+                # More than a period behind: skip the missed frame ids so
+                # telemetry stays on schedule instead of bursting to catch up
+                frame_id = int((now - start) / frame_interval)
+                next_tick = start + frame_id * frame_interval
+            await asyncio.sleep(max(0.0, next_tick - now))
             
     except WebSocketDisconnect:
         print("Client disconnected")
@@ -176,4 +204,15 @@ async def stream_video(websocket: WebSocket):
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8001,
+        # uvloop has no Windows build; fall back to the stock loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=False,
+        # Explicit, or uvicorn would take the count from WEB_CONCURRENCY
+        workers=1
+    )